@@ -9,12 +9,21 @@ evaluation, and lightweight ML-powered cost prediction and design ranking.
 Academic Project - Final Year Major Project with ML v2.0
 """
 
-from flask import Flask, request, jsonify, session
+from flask import Flask, Response, request, jsonify, session
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from werkzeug.middleware.shared_data import SharedDataMiddleware
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+import hashlib
 import json
 import os
+import pickle
 import secrets
+import tempfile
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -22,7 +31,9 @@ load_dotenv()
 
 from constraints import ConstraintEngine
 from generator import DesignGenerator
-from evaluator import SustainabilityEvaluator
+from evaluator import SustainabilityEvaluator, warm_up_kernels as warm_up_scoring_kernels
+from project_writer import ProjectWriter
+from json_provider import OrjsonProvider, ORJSON_AVAILABLE
 
 # Try Supabase first, fallback to SQLite
 use_supabase = False
@@ -31,7 +42,7 @@ try:
     if test_connection():
         from db_supabase import (
             initialize_db,
-            save_project,
+            save_projects,
             list_projects,
             get_project,
             create_user,
@@ -46,7 +57,7 @@ except Exception as e:
     print(f"⚠ Supabase unavailable ({e}), using SQLite")
     from db import (
         initialize_db,
-        save_project,
+        save_projects,
         list_projects,
         get_project,
         create_user,
@@ -56,7 +67,8 @@ except Exception as e:
 from simple_ml import (
     SimpleCostPredictor, SimpleDesignRanker, SimpleDesignRecommender,
     generate_synthetic_cost_data, generate_synthetic_preference_data,
-    generate_synthetic_historical_projects
+    generate_synthetic_historical_projects,
+    warm_up_kernels as warm_up_cost_kernels
 )
 from data_loader import (
     auto_load_training_data,
@@ -69,19 +81,55 @@ from data_loader import (
 frontend_build_path = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'dist')
 absolute_frontend_path = os.path.abspath(frontend_build_path)
 
+SECRET_KEY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.flask_secret')
+
+def load_secret_key():
+    """
+    Use SECRET_KEY from the environment, otherwise a key generated once and
+    kept in .flask_secret, so restarts and all workers sign sessions alike
+    """
+    key = os.getenv('SECRET_KEY')
+    if key:
+        return key
+    
+    print(f"⚠ SECRET_KEY not set, using key from {SECRET_KEY_FILE}")
+    key = secrets.token_hex(32)
+    try:
+        # Write the key to a temp file and link it into place, so the key
+        # file only ever appears complete and exactly one process creates it
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(SECRET_KEY_FILE), prefix='.flask_secret.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(key)
+            os.link(tmp_path, SECRET_KEY_FILE)
+        except FileExistsError:
+            with open(SECRET_KEY_FILE) as f:
+                existing = f.read().strip()
+            if existing:
+                return existing
+            print(f"⚠ {SECRET_KEY_FILE} is empty, sessions will not survive restarts")
+        finally:
+            os.unlink(tmp_path)
+    except OSError as e:
+        print(f"⚠ Could not persist secret key ({e}), sessions will not survive restarts")
+    return key
+
 # Initialize Flask App
+# Frontend files are served by the static middleware and SPA route below
+# rather than Flask's static route, which would shadow the SPA fallback
 print(f"🔍 Looking for frontend at: {absolute_frontend_path}")
-print(f"🔍 Frontend exists: {os.path.exists(absolute_frontend_path)}")
-if os.path.exists(absolute_frontend_path):
-    index_file = os.path.join(absolute_frontend_path, 'index.html')
-    print(f"🔍 index.html exists: {os.path.exists(index_file)}")
-    app = Flask(__name__, static_folder=absolute_frontend_path, static_url_path='/')
+frontend_available = os.path.isfile(os.path.join(absolute_frontend_path, 'index.html'))
+print(f"🔍 index.html exists: {frontend_available}")
+if frontend_available:
     print(f"✓ Serving frontend from {absolute_frontend_path}")
 else:
     print(f"⚠ Frontend not found at {absolute_frontend_path}, API-only mode")
-    app = Flask(__name__)
+app = Flask(__name__, static_folder=None)
+app.url_map.strict_slashes = False
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', secrets.token_hex(32))
+app.config['SECRET_KEY'] = load_secret_key()
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production with HTTPS
 
@@ -92,36 +140,108 @@ if frontend_url:
 
 CORS(app, supports_credentials=True, origins=allowed_origins)
 
-# Serve frontend static files for SPA routing
-@app.route('/')
-def serve_frontend_index():
-    """Serve index.html for root path"""
-    index_path = os.path.join(absolute_frontend_path, 'index.html')
-    if os.path.exists(index_path):
-        from flask import send_file
-        return send_file(index_path)
-    return {'status': 'API active', 'message': 'Frontend not built'}, 200
+@app.after_request
+def add_cache_headers(response):
+    """Make browsers revalidate the SPA shell so new deploys are picked up"""
+    if response.mimetype == 'text/html':
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# Paths with these extensions are real build files; anything else is a
+# client-side route and gets index.html without touching the filesystem
+STATIC_EXTS = frozenset({
+    '.js', '.css', '.map', '.json', '.webmanifest', '.txt',
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp',
+    '.woff', '.woff2', '.ttf'
+})
+
+# Vite emits content-hashed file names under /assets, so they never change
+ASSET_CACHE_SECONDS = 31536000
+
+# index.html is tiny and only changes on deploy, so keep it in memory
+# together with its ETag as a single (bytes, etag) tuple
+index_path = os.path.join(absolute_frontend_path, 'index.html')
+index_page = None
+INDEX_WATCH_SECONDS = 1.0
+
+def load_index_page():
+    global index_page
+    with open(index_path, 'rb') as f:
+        html = f.read()
+    index_page = (html, hashlib.md5(html).hexdigest())
+
+def _watch_index_page():
+    """Development only: reload index.html when a rebuild changes it"""
+    last_mtime = os.path.getmtime(index_path)
+    while True:
+        time.sleep(INDEX_WATCH_SECONDS)
+        try:
+            mtime = os.path.getmtime(index_path)
+            if mtime != last_mtime:
+                load_index_page()
+                last_mtime = mtime
+        except OSError:
+            pass  # Mid-rebuild; try again on the next tick
+
+def _start_index_watcher():
+    threading.Thread(target=_watch_index_page, name='index-watcher', daemon=True).start()
+
+if frontend_available:
+    load_index_page()
+    if os.getenv('FLASK_ENV', 'development') != 'production':
+        _start_index_watcher()
+        os.register_at_fork(after_in_child=_start_index_watcher)
+
+    # Existing build files are answered at the WSGI layer (ETag, 304s,
+    # sendfile where the server supports it) before Flask routing runs.
+    # Only the build's own top-level entries are mounted, so API and SPA
+    # paths never hit the filesystem. Top-level files (icons, manifest,
+    # service worker) revalidate on every use; index.html is left to the
+    # SPA route below.
+    top_level_exports = {
+        '/' + name: os.path.join(absolute_frontend_path, name)
+        for name in os.listdir(absolute_frontend_path)
+        if name not in ('index.html', 'assets')
+    }
+    if top_level_exports:
+        app.wsgi_app = SharedDataMiddleware(
+            app.wsgi_app,
+            top_level_exports,
+            cache_timeout=0
+        )
+    app.wsgi_app = SharedDataMiddleware(
+        app.wsgi_app,
+        {'/assets': os.path.join(absolute_frontend_path, 'assets')},
+        cache_timeout=ASSET_CACHE_SECONDS
+    )
 
+# SPA routing: anything the static middleware didn't answer ends up here
+@app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_frontend_routes(path):
-    """Serve frontend for SPA routing, fallback for non-API routes"""
+    """Serve index.html for client-side routes, 404 for API and missing files"""
     # If it's an API route, don't serve frontend
     if path.startswith('api/'):
         return {'error': 'Endpoint not found'}, 404
     
-    # Try to serve static files
-    static_file_path = os.path.join(absolute_frontend_path, path)
-    if os.path.exists(static_file_path) and os.path.isfile(static_file_path):
-        from flask import send_file
-        return send_file(static_file_path)
+    if index_page is None:
+        if not path:
+            return {'status': 'API active', 'message': 'Frontend not built'}, 200
+        return {'error': 'Not found'}, 404
     
-    # Serve index.html for SPA routing
-    index_path = os.path.join(absolute_frontend_path, 'index.html')
-    if os.path.exists(index_path):
-        from flask import send_file
-        return send_file(index_path)
+    # Existing static files were already served by the middleware
+    if os.path.splitext(path)[1].lower() in STATIC_EXTS:
+        return {'error': 'Not found'}, 404
     
-    return {'error': 'Not found'}, 404
+    # Serve index.html for SPA routing, or 304 if the client has it
+    html, etag = index_page
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(html, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 # Initialize OAuth
 try:
@@ -139,46 +259,107 @@ constraint_engine = ConstraintEngine()
 design_generator = DesignGenerator()
 evaluator = SustainabilityEvaluator()
 
-# Initialize SQLite DB
-initialize_db()
-
 # Initialize Lightweight ML Models
 cost_predictor = SimpleCostPredictor()
 design_ranker = SimpleDesignRanker()
 design_recommender = SimpleDesignRecommender()
 
-# Train models with real data (or synthetic fallback)
-try:
-    print("🤖 Initializing ML models...")
-    
-    # Try to load real datasets from data/ folder
-    import os
-    data_path = os.path.join(os.path.dirname(__file__), 'data')
-    real_data = auto_load_training_data(data_path)
-    
-    if real_data['cost']:
-        # Train with real data
-        print("✓ Training with REAL datasets...")
-        cost_predictor.train(prepare_cost_training_data(real_data['cost']))
-        design_ranker.train(prepare_preference_training_data(real_data['preference']))
-        design_recommender.learn_from_history(prepare_historical_training_data(real_data['historical']))
-        print(f"✓ ML Models trained on {len(real_data['cost'])} real samples")
-    else:
-        # Fallback to synthetic data
-        print("ℹ No real data found - using synthetic training data")
-        cost_predictor.train(generate_synthetic_cost_data(200))
-        design_ranker.train(generate_synthetic_preference_data(150))
-        design_recommender.learn_from_history(generate_synthetic_historical_projects(100))
-        print("✓ ML Models trained on synthetic data")
-    
-    ml_models_ready = True
-    
-except Exception as e:
-    print(f"⚠ ML training error: {e}")
-    ml_models_ready = True  # Still ready with defaults
+# DB setup, kernel compilation, data loading and training are independent,
+# so overlap them. The pool is shut down before gunicorn forks workers.
+with ThreadPoolExecutor(max_workers=4, thread_name_prefix='startup') as startup_pool:
+    # Initialize SQLite DB
+    db_future = startup_pool.submit(initialize_db)
+
+    # Compile numeric kernels now so the first request doesn't pay for it
+    warm_up_futures = [
+        startup_pool.submit(warm_up_scoring_kernels),
+        startup_pool.submit(warm_up_cost_kernels),
+    ]
+
+    # Train models with real data (or synthetic fallback)
+    try:
+        print("🤖 Initializing ML models...")
+        
+        # Try to load real datasets from data/ folder
+        data_path = os.path.join(os.path.dirname(__file__), 'data')
+        real_data = auto_load_training_data(data_path)
+        
+        if real_data['cost']:
+            # Train with real data
+            print("✓ Training with REAL datasets...")
+            training = [
+                startup_pool.submit(lambda: cost_predictor.train(
+                    prepare_cost_training_data(real_data['cost']))),
+                startup_pool.submit(lambda: design_ranker.train(
+                    prepare_preference_training_data(real_data['preference']))),
+                startup_pool.submit(lambda: design_recommender.learn_from_history(
+                    prepare_historical_training_data(real_data['historical']))),
+            ]
+            for future in training:
+                future.result()
+            print(f"✓ ML Models trained on {len(real_data['cost'])} real samples")
+        else:
+            # Fallback to synthetic data
+            print("ℹ No real data found - using synthetic training data")
+            training = [
+                startup_pool.submit(lambda: cost_predictor.train(generate_synthetic_cost_data(200))),
+                startup_pool.submit(lambda: design_ranker.train(generate_synthetic_preference_data(150))),
+                startup_pool.submit(lambda: design_recommender.learn_from_history(
+                    generate_synthetic_historical_projects(100))),
+            ]
+            for future in training:
+                future.result()
+            print("✓ ML Models trained on synthetic data")
+        
+        ml_models_ready = True
+        
+    except Exception as e:
+        print(f"⚠ ML training error: {e}")
+        ml_models_ready = True  # Still ready with defaults
+
+    # Surface DB setup and kernel compilation failures the same way as before
+    db_future.result()
+    for future in warm_up_futures:
+        future.result()
+
+project_writer = ProjectWriter(save_projects)
+
+# Response timestamps come from a value refreshed by a background thread
+# rather than reading and formatting the clock on every request
+CLOCK_REFRESH_SECONDS = 0.5
+_now_iso = [datetime.now().isoformat(timespec='seconds')]
+
+def _run_clock():
+    while True:
+        time.sleep(CLOCK_REFRESH_SECONDS)
+        _now_iso[0] = datetime.now().isoformat(timespec='seconds')
+
+def _start_clock():
+    _now_iso[0] = datetime.now().isoformat(timespec='seconds')
+    threading.Thread(target=_run_clock, name='clock', daemon=True).start()
+
+_start_clock()
+# Threads don't survive fork, so restart the clock in each gunicorn worker
+os.register_at_fork(after_in_child=_start_clock)
 
 # ==================== ROUTES ====================
 
+# Largest request body accepted by the API. Werkzeug enforces this on the
+# input stream (chunked bodies included) by raising 413 Request Entity Too Large.
+MAX_JSON_BODY_BYTES = 1_000_000
+app.config['MAX_CONTENT_LENGTH'] = MAX_JSON_BODY_BYTES
+
+
+def json_body():
+    """Parse the request body as JSON with the app's JSON provider (orjson when installed)"""
+    raw = request.get_data(cache=False)
+    # Streamed (chunked) bodies are cut off at MAX_CONTENT_LENGTH rather than
+    # rejected, so a body that fills the limit is treated as too large.
+    if request.content_length is None and len(raw) >= MAX_JSON_BODY_BYTES:
+        raise RequestEntityTooLarge()
+    return app.json.loads(raw)
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -186,7 +367,7 @@ def health():
         'status': 'healthy',
         'service': 'Sustainable Design API',
         'ml_enabled': ml_models_ready,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': _now_iso[0]
     }), 200
 
 
@@ -204,15 +385,15 @@ def validate_constraints():
     }
     """
     try:
-        data = request.json
+        data = json_body()
         
         # Validate constraints
-        is_valid, errors = constraint_engine.validate(data)
+        error_mask = constraint_engine.error_mask(data)
         
-        if not is_valid:
+        if error_mask:
             return jsonify({
                 'valid': False,
-                'errors': errors
+                'errors': constraint_engine.decode_errors(error_mask)
             }), 400
         
         # Process constraints through logic engine
@@ -225,10 +406,132 @@ def validate_constraints():
             'feasibility_score': constraint_engine.calculate_feasibility(processed)
         }), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# ML failures are reported on the first occurrence and then every Nth time,
+# so a persistent error is visible without flooding the log
+ML_ERROR_REPORT_EVERY = 100
+_ml_error_counts = {}
+
+def _report_ml_error(task, error):
+    count = _ml_error_counts.get(task, 0) + 1
+    _ml_error_counts[task] = count
+    if count % ML_ERROR_REPORT_EVERY == 1:
+        print(f"⚠ ML {task} failed ({count} so far): {error}")
+
+
+# Worker threads for the independent ML calls in _run_designs_pipeline. Threads
+# are only started on first submit, so nothing is inherited across fork.
+ML_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix='ml')
+
+
+class _PartialResult(Exception):
+    """Carries a result out of _cached_designs so lru_cache doesn't keep it"""
+
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+
+def _compute_designs(constraints_key):
+    """
+    Run the generation pipeline for a canonical constraints tuple.
+
+    Returns:
+        (designs, ml_rankings, recommendations), freshly built for the caller
+    """
+    try:
+        cached = _cached_designs(constraints_key)
+    except _PartialResult as partial:
+        return partial.result
+    return pickle.loads(cached)
+
+
+@lru_cache(maxsize=512)
+def _cached_designs(constraints_key):
+    """
+    The generator, evaluator and trained models are deterministic for a
+    given (area, budget, climate, priority), so results are memoized.
+    They are stored pickled because callers modify the returned dicts
+    (e.g. rank_designs writes design['ranking']). Results where an ML
+    step failed are not cached. Call _cached_designs.cache_clear() after
+    retraining the models.
+    """
+    result, complete = _run_designs_pipeline(constraints_key)
+    if not complete:
+        raise _PartialResult(result)
+    return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _run_designs_pipeline(constraints_key):
+    """
+    Returns:
+        ((designs, ml_rankings, recommendations), complete) where complete
+        is False if any ML step raised
+    """
+    _ml = ml_models_ready
+    complete = True
+    area, budget, climate, priority = constraints_key
+    constraints = {'area': area, 'budget': budget, 'climate': climate, 'priority': priority}
+
+    # Generate design alternatives
+    designs = design_generator.generate(constraints)
+
+    # Evaluate all designs in one batch
+    evaluated_designs = designs
+    for design, metrics in zip(designs, evaluator.evaluate_batch(designs, constraints)):
+        design['metrics'] = metrics
+
+    ml_rankings = None
+    recommendations = None
+    if _ml:
+        # Cost prediction, ranking and recommendation are independent, so
+        # run them concurrently (skipping untrained models) and wait for all
+        cost_future = ranking_future = recommendation_future = None
+        if cost_predictor.is_trained:
+            cost_future = ML_POOL.submit(
+                cost_predictor.predict_batch, area, budget, climate, priority, range(len(designs))
+            )
+        if design_ranker.is_trained:
+            ranking_future = ML_POOL.submit(design_ranker.rank_designs, evaluated_designs, constraints)
+        if design_recommender.is_trained:
+            recommendation_future = ML_POOL.submit(design_recommender.recommend_design, constraints)
+        wait([f for f in (cost_future, ranking_future, recommendation_future) if f is not None])
+
+        # Add ML-powered cost predictions
+        if cost_future is not None:
+            try:
+                for design, predicted_cost in zip(designs, cost_future.result()):
+                    if predicted_cost:
+                        design['ml_predicted_cost'] = predicted_cost
+            except Exception as e:
+                _report_ml_error('cost prediction', e)
+                complete = False
+
+        # ML-powered design ranking
+        if ranking_future is not None:
+            try:
+                ml_rankings = [{'id': d.get('id'), 'ml_score': round(score, 2)}
+                              for d, score in ranking_future.result()]
+            except Exception as e:
+                _report_ml_error('ranking', e)
+                complete = False
+
+        # Design recommendations from historical patterns
+        if recommendation_future is not None:
+            try:
+                recommendations = recommendation_future.result()
+            except Exception as e:
+                _report_ml_error('recommendation', e)
+                complete = False
+
+    return (evaluated_designs, ml_rankings, recommendations), complete
+
+
 @app.route('/api/designs/generate', methods=['POST'])
 def generate_designs():
     """
@@ -242,82 +545,47 @@ def generate_designs():
         "priority": str
     }
     """
+    _ml = ml_models_ready
     try:
-        constraints = request.json
+        constraints = json_body()
         user_id = constraints.get('user_id')
         
         # Validate constraints
-        is_valid, _ = constraint_engine.validate(constraints)
-        if not is_valid:
+        if constraint_engine.error_mask(constraints):
             return jsonify({'error': 'Invalid constraints'}), 400
         
-        # Generate design alternatives
-        designs = design_generator.generate(constraints)
-        
-        # Evaluate each design
-        evaluated_designs = []
-        for idx, design in enumerate(designs):
-            design['metrics'] = evaluator.evaluate(design, constraints)
-            
-            # Add ML-powered cost prediction if available
-            if ml_models_ready:
-                try:
-                    predicted_cost = cost_predictor.predict(
-                        constraints['area'],
-                        constraints['budget'],
-                        constraints['climate'],
-                        constraints['priority'],
-                        idx
-                    )
-                    if predicted_cost:
-                        design['ml_predicted_cost'] = predicted_cost
-                except:
-                    pass
-            
-            evaluated_designs.append(design)
-        
-        # ML-powered design ranking if available
-        ml_rankings = None
-        if ml_models_ready:
-            try:
-                ranked = design_ranker.rank_designs(evaluated_designs, constraints)
-                ml_rankings = [{'id': d.get('id'), 'ml_score': round(score, 2)} 
-                              for d, score in ranked]
-            except:
-                pass
-        
-        # Get design recommendations from historical patterns
-        recommendations = None
-        if ml_models_ready:
-            try:
-                recommendations = design_recommender.recommend_design(constraints)
-            except:
-                pass
+        constraints_key = (
+            constraints['area'],
+            constraints['budget'],
+            constraints['climate'],
+            constraints['priority']
+        )
+        evaluated_designs, ml_rankings, recommendations = _compute_designs(constraints_key)
         
         response = {
             'designs': evaluated_designs,
             'count': len(evaluated_designs),
             'constraints': constraints,
-            'generated_at': datetime.now().isoformat()
+            'generated_at': _now_iso[0]
         }
         
         # Add ML enhancements if available
-        if ml_models_ready:
+        if _ml:
             response['ml_rankings'] = ml_rankings
             response['recommendations'] = recommendations
 
-        # Persist project to SQLite
-        try:
-            project_id = save_project(constraints, evaluated_designs, {
-                'ml_rankings': ml_rankings,
-                'recommendations': recommendations
-            }, user_id=user_id)
+        # Persist project in the background; the response doesn't wait for the DB
+        project_id = project_writer.submit(constraints, evaluated_designs, {
+            'ml_rankings': ml_rankings,
+            'recommendations': recommendations
+        }, user_id=user_id)
+        if project_id is not None:
             response['project_id'] = project_id
-        except Exception:
-            pass
         
         return jsonify(response), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -335,11 +603,16 @@ def get_projects():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/projects/<int:project_id>', methods=['GET'])
+@app.route('/api/projects/<project_id>', methods=['GET'])
 def get_project_by_id(project_id):
-    """Get a saved project by ID"""
+    """
+    Get a saved project by ID or by the project_id returned from generation.
+    Projects are written in the background, so a project_id that was just
+    returned can 404 for a moment (normally well under a second) until the
+    writer flushes it.
+    """
     try:
-        project = get_project(project_id)
+        project = get_project(int(project_id) if project_id.isdigit() else project_id)
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         return jsonify(project), 200
@@ -351,11 +624,13 @@ def get_project_by_id(project_id):
 def clear_project_history():
     """Clear project history (optionally per user)"""
     try:
-        data = request.json or {}
+        data = json_body() or {}
         user_id = data.get('user_id')
         guest = bool(data.get('guest'))
         deleted = clear_projects(user_id=user_id, guest=guest)
         return jsonify({'deleted': deleted}), 200
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -364,7 +639,7 @@ def clear_project_history():
 def signup():
     """Create a new user account"""
     try:
-        data = request.json
+        data = json_body()
         name = data.get('name', '').strip()
         email = data.get('email', '').strip()
         password = data.get('password', '').strip()
@@ -381,6 +656,8 @@ def signup():
                 return jsonify({'error': 'Email already exists'}), 409
             print(f"❌ Signup error: {str(e)}")
             return jsonify({'error': str(e)}), 500
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Signup error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -390,7 +667,7 @@ def signup():
 def login():
     """Login with email and password"""
     try:
-        data = request.json
+        data = json_body()
         email = data.get('email', '').strip()
         password = data.get('password', '').strip()
 
@@ -404,6 +681,8 @@ def login():
 
         print(f"✓ User logged in: {email}")
         return jsonify({'user': user}), 200
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Login error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -421,7 +700,7 @@ def evaluate_design(design_id):
     }
     """
     try:
-        data = request.json
+        data = json_body()
         design = data.get('design')
         constraints = data.get('constraints')
         
@@ -434,9 +713,11 @@ def evaluate_design(design_id):
         return jsonify({
             'design_id': design_id,
             'metrics': metrics,
-            'evaluation_timestamp': datetime.now().isoformat()
+            'evaluation_timestamp': _now_iso[0]
         }), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -453,7 +734,7 @@ def get_rankings():
     }
     """
     try:
-        data = request.json
+        data = json_body()
         designs = data.get('designs', [])
         constraints = data.get('constraints', {})
         
@@ -465,13 +746,13 @@ def get_rankings():
         
         # ML-based ranking if available
         ml_rankings = None
-        if ml_models_ready:
+        if ml_models_ready and design_ranker.is_trained:
             try:
                 ranked = design_ranker.rank_designs(designs, constraints)
                 ml_rankings = [{'id': d.get('id'), 'ml_score': round(score, 2)} 
                               for d, score in ranked]
-            except:
-                pass
+            except Exception as e:
+                _report_ml_error('ranking', e)
         
         response = {
             'rule_based_rankings': rule_based_rankings,
@@ -483,6 +764,8 @@ def get_rankings():
         
         return jsonify(response), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -505,7 +788,7 @@ def predict_cost():
         return jsonify({'error': 'ML models not available'}), 503
     
     try:
-        data = request.json
+        data = json_body()
         
         predicted_cost = cost_predictor.predict(
             data.get('area', 1000),
@@ -528,6 +811,8 @@ def predict_cost():
             'model': 'LinearRegression'
         }), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -549,7 +834,7 @@ def get_recommendations():
         return jsonify({'error': 'ML models not available'}), 503
     
     try:
-        constraints = request.json
+        constraints = json_body()
         
         recommendations = design_recommender.recommend_design(constraints, top_n=3)
         
@@ -566,37 +851,44 @@ def get_recommendations():
         
         return jsonify(response), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# Metadata is constant once ml_models_ready is settled at startup, so it
+# is serialized a single time and served as raw bytes
+METADATA_BODY = app.json.dumps({
+    'project': 'Sustainable Design and Planning Using Generative AI',
+    'version': '2.0.0',
+    'type': 'Decision-Support System with ML',
+    'scope': [
+        'Constraint-aware design generation',
+        'Sustainability impact evaluation',
+        'ML-powered cost prediction',
+        'Design ranking and recommendations',
+        'Interactive comparison and visualization'
+    ],
+    'capabilities': {
+        'constraints': ['area', 'budget', 'climate', 'priority'],
+        'metrics': ['energyEfficiency', 'waterEfficiency', 'carbonFootprint'],
+        'designs_per_generation': 3,
+        'ml_features': [
+            'Cost prediction (LinearRegression)',
+            'Design ranking (Priority-weighted)',
+            'Recommendations (HistoricalSimilarity)'
+        ]
+    },
+    'ml_enabled': ml_models_ready,
+    'academic_context': 'Final-year college project demonstrating AI-powered sustainable design'
+}).encode()
+
+
 @app.route('/api/metadata', methods=['GET'])
 def get_metadata():
     """Get system metadata and capabilities"""
-    return jsonify({
-        'project': 'Sustainable Design and Planning Using Generative AI',
-        'version': '2.0.0',
-        'type': 'Decision-Support System with ML',
-        'scope': [
-            'Constraint-aware design generation',
-            'Sustainability impact evaluation',
-            'ML-powered cost prediction',
-            'Design ranking and recommendations',
-            'Interactive comparison and visualization'
-        ],
-        'capabilities': {
-            'constraints': ['area', 'budget', 'climate', 'priority'],
-            'metrics': ['energyEfficiency', 'waterEfficiency', 'carbonFootprint'],
-            'designs_per_generation': 3,
-            'ml_features': [
-                'Cost prediction (LinearRegression)',
-                'Design ranking (Priority-weighted)',
-                'Recommendations (HistoricalSimilarity)'
-            ]
-        },
-        'ml_enabled': ml_models_ready,
-        'academic_context': 'Final-year college project demonstrating AI-powered sustainable design'
-    }), 200
+    return Response(METADATA_BODY, mimetype='application/json')
 
 
 # ==================== ERROR HANDLERS ====================
@@ -606,6 +898,11 @@ def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
 
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({'error': 'Request body too large'}), 413
+
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
@@ -613,6 +910,7 @@ def internal_error(error):
 
 # ==================== MAIN ====================
 
+# Development server only; production runs under gunicorn (see wsgi.py)
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     is_production = os.getenv('FLASK_ENV', 'development') == 'production'
@@ -3,6 +3,44 @@ Constraint Modeling Engine
 Processes and validates user constraints, applies feasibility rules
 """
 
+AREA_MIN = 300
+AREA_MAX = 2000
+BUDGET_MIN = 0
+BUDGET_MAX = 100
+VALID_CLIMATES = ('cold', 'moderate', 'hot')
+VALID_PRIORITIES = ('energy', 'water', 'materials')
+
+# Validation schema: (field, accepted types, min, max, allowed values)
+# Fields with an allowed-value set are checked by membership instead of range
+_SCHEMA = (
+    ('area', int, AREA_MIN, AREA_MAX, None),
+    ('budget', (int, float), BUDGET_MIN, BUDGET_MAX, None),
+    ('climate', None, None, None, frozenset(VALID_CLIMATES)),
+    ('priority', None, None, None, frozenset(VALID_PRIORITIES)),
+)
+
+# Each field owns three bits of the error mask
+ERR_MISSING = 1
+ERR_TYPE = 2
+ERR_VALUE = 4
+_BITS_PER_FIELD = 3
+
+# Error message for each mask bit, in schema order (None = bit never set)
+_ERROR_MESSAGES = (
+    'Area is required',
+    'Area must be an integer',
+    f'Area must be between {AREA_MIN} and {AREA_MAX} sq ft',
+    'Budget is required',
+    'Budget must be a number',
+    f'Budget must be between {BUDGET_MIN} and {BUDGET_MAX}%',
+    'Climate is required',
+    None,
+    f'Climate must be one of: {", ".join(VALID_CLIMATES)}',
+    'Priority is required',
+    None,
+    f'Priority must be one of: {", ".join(VALID_PRIORITIES)}',
+)
+
 
 class ConstraintEngine:
     """
@@ -11,12 +49,12 @@ class ConstraintEngine:
     """
     
     def __init__(self):
-        self.AREA_MIN = 300
-        self.AREA_MAX = 2000
-        self.BUDGET_MIN = 0
-        self.BUDGET_MAX = 100
-        self.VALID_CLIMATES = ['cold', 'moderate', 'hot']
-        self.VALID_PRIORITIES = ['energy', 'water', 'materials']
+        self.AREA_MIN = AREA_MIN
+        self.AREA_MAX = AREA_MAX
+        self.BUDGET_MIN = BUDGET_MIN
+        self.BUDGET_MAX = BUDGET_MAX
+        self.VALID_CLIMATES = list(VALID_CLIMATES)
+        self.VALID_PRIORITIES = list(VALID_PRIORITIES)
     
     def validate(self, constraints):
         """
@@ -25,37 +63,36 @@ class ConstraintEngine:
         Returns:
             (is_valid: bool, errors: list)
         """
-        errors = []
-        
-        # Validate area
-        if 'area' not in constraints:
-            errors.append('Area is required')
-        elif not isinstance(constraints['area'], int):
-            errors.append('Area must be an integer')
-        elif constraints['area'] < self.AREA_MIN or constraints['area'] > self.AREA_MAX:
-            errors.append(f'Area must be between {self.AREA_MIN} and {self.AREA_MAX} sq ft')
-        
-        # Validate budget
-        if 'budget' not in constraints:
-            errors.append('Budget is required')
-        elif not isinstance(constraints['budget'], (int, float)):
-            errors.append('Budget must be a number')
-        elif constraints['budget'] < self.BUDGET_MIN or constraints['budget'] > self.BUDGET_MAX:
-            errors.append(f'Budget must be between {self.BUDGET_MIN} and {self.BUDGET_MAX}%')
-        
-        # Validate climate
-        if 'climate' not in constraints:
-            errors.append('Climate is required')
-        elif constraints['climate'] not in self.VALID_CLIMATES:
-            errors.append(f'Climate must be one of: {", ".join(self.VALID_CLIMATES)}')
-        
-        # Validate priority
-        if 'priority' not in constraints:
-            errors.append('Priority is required')
-        elif constraints['priority'] not in self.VALID_PRIORITIES:
-            errors.append(f'Priority must be one of: {", ".join(self.VALID_PRIORITIES)}')
+        mask = self.error_mask(constraints)
+        return mask == 0, self.decode_errors(mask)
+    
+    def error_mask(self, constraints):
+        """
+        Check constraints against the schema in a single pass
         
-        return len(errors) == 0, errors
+        Returns:
+            int with ERR_* bits set per failing field (0 when valid)
+        """
+        mask = 0
+        shift = 0
+        for field, types, lo, hi, allowed in _SCHEMA:
+            if field not in constraints:
+                mask |= ERR_MISSING << shift
+            else:
+                value = constraints[field]
+                if allowed is not None:
+                    if not (isinstance(value, str) and value in allowed):
+                        mask |= ERR_VALUE << shift
+                elif not isinstance(value, types):
+                    mask |= ERR_TYPE << shift
+                elif value < lo or value > hi:
+                    mask |= ERR_VALUE << shift
+            shift += _BITS_PER_FIELD
+        return mask
+    
+    def decode_errors(self, mask):
+        """Translate an error mask into human-readable messages"""
+        return [message for bit, message in enumerate(_ERROR_MESSAGES) if mask >> bit & 1]
     
     def process(self, constraints):
         """
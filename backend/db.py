@@ -7,7 +7,7 @@ import json
 import hashlib
 import secrets
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 DB_PATH = "database.db"
 
@@ -58,6 +58,7 @@ def initialize_db():
             """
             CREATE TABLE IF NOT EXISTS projects (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
+                uid TEXT,
                 user_id INTEGER,
                 area INTEGER,
                 budget INTEGER,
@@ -70,30 +71,52 @@ def initialize_db():
             """
         )
         _ensure_column(conn, "projects", "user_id", "INTEGER")
+        _ensure_column(conn, "projects", "uid", "TEXT")
+        # uid is unique so a batch retried after an ambiguous failure can't
+        # insert a project twice; drop duplicates left by earlier versions
+        cur.execute("DROP INDEX IF EXISTS idx_projects_uid")
+        cur.execute(
+            """
+            DELETE FROM projects
+            WHERE uid IS NOT NULL
+              AND id NOT IN (SELECT MIN(id) FROM projects WHERE uid IS NOT NULL GROUP BY uid)
+            """
+        )
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_projects_uid_unique ON projects(uid)")
         conn.commit()
 
 
-def save_project(constraints: Dict[str, Any], designs: List[Dict[str, Any]], ml_data: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None) -> int:
+def _project_row(constraints: Dict[str, Any], designs: List[Dict[str, Any]], ml_data: Optional[Dict[str, Any]], user_id: Optional[int], project_uid: Optional[str], created_at: str) -> Tuple:
+    return (
+        project_uid,
+        user_id,
+        constraints.get("area"),
+        constraints.get("budget"),
+        constraints.get("climate"),
+        constraints.get("priority"),
+        json.dumps(designs),
+        json.dumps(ml_data or {}),
+        created_at,
+    )
+
+
+# OR IGNORE skips projects whose uid is already stored, so retried batches are harmless
+_INSERT_PROJECT = """
+    INSERT OR IGNORE INTO projects (uid, user_id, area, budget, climate, priority, designs_json, ml_json, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def save_projects(projects: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]], Optional[Dict[str, Any]], Optional[int]]]) -> None:
+    """Insert several (project_uid, constraints, designs, ml_data, user_id) items in one transaction"""
+    created_at = datetime.now().isoformat()
+    rows = [
+        _project_row(constraints, designs, ml_data, user_id, project_uid, created_at)
+        for project_uid, constraints, designs, ml_data, user_id in projects
+    ]
     with _connect() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO projects (user_id, area, budget, climate, priority, designs_json, ml_json, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                user_id,
-                constraints.get("area"),
-                constraints.get("budget"),
-                constraints.get("climate"),
-                constraints.get("priority"),
-                json.dumps(designs),
-                json.dumps(ml_data or {}),
-                datetime.now().isoformat(),
-            ),
-        )
+        conn.executemany(_INSERT_PROJECT, rows)
         conn.commit()
-        return cur.lastrowid
 
 
 def list_projects(limit: int = 50, user_id: Optional[int] = None, guest: bool = False) -> List[Dict[str, Any]]:
@@ -102,7 +125,7 @@ def list_projects(limit: int = 50, user_id: Optional[int] = None, guest: bool =
         if guest:
             cur.execute(
                 """
-                SELECT id, user_id, area, budget, climate, priority, created_at
+                SELECT id, uid, user_id, area, budget, climate, priority, created_at
                 FROM projects
                 WHERE user_id IS NULL
                 ORDER BY id DESC
@@ -113,7 +136,7 @@ def list_projects(limit: int = 50, user_id: Optional[int] = None, guest: bool =
         elif user_id is not None:
             cur.execute(
                 """
-                SELECT id, user_id, area, budget, climate, priority, created_at
+                SELECT id, uid, user_id, area, budget, climate, priority, created_at
                 FROM projects
                 WHERE user_id = ?
                 ORDER BY id DESC
@@ -124,7 +147,7 @@ def list_projects(limit: int = 50, user_id: Optional[int] = None, guest: bool =
         else:
             cur.execute(
                 """
-                SELECT id, user_id, area, budget, climate, priority, created_at
+                SELECT id, uid, user_id, area, budget, climate, priority, created_at
                 FROM projects
                 ORDER BY id DESC
                 LIMIT ?
@@ -135,25 +158,28 @@ def list_projects(limit: int = 50, user_id: Optional[int] = None, guest: bool =
         return [
             {
                 "id": r[0],
-                "user_id": r[1],
-                "area": r[2],
-                "budget": r[3],
-                "climate": r[4],
-                "priority": r[5],
-                "created_at": r[6],
+                "uid": r[1],
+                "user_id": r[2],
+                "area": r[3],
+                "budget": r[4],
+                "climate": r[5],
+                "priority": r[6],
+                "created_at": r[7],
             }
             for r in rows
         ]
 
 
-def get_project(project_id: int) -> Optional[Dict[str, Any]]:
+def get_project(project_id: Union[int, str]) -> Optional[Dict[str, Any]]:
+    """Look up a project by integer id or by the uid assigned at generation time"""
+    column = "id" if isinstance(project_id, int) else "uid"
     with _connect() as conn:
         cur = conn.cursor()
         cur.execute(
-            """
-            SELECT id, user_id, area, budget, climate, priority, designs_json, ml_json, created_at
+            f"""
+            SELECT id, user_id, area, budget, climate, priority, designs_json, ml_json, created_at, uid
             FROM projects
-            WHERE id = ?
+            WHERE {column} = ?
             """,
             (project_id,),
         )
@@ -162,6 +188,7 @@ def get_project(project_id: int) -> Optional[Dict[str, Any]]:
             return None
         return {
             "id": row[0],
+            "uid": row[9],
             "user_id": row[1],
             "area": row[2],
             "budget": row[3],
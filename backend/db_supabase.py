@@ -3,8 +3,12 @@ Supabase PostgreSQL Database Module
 Uses psycopg2 to connect to Supabase PostgreSQL
 """
 import os
+import atexit
+import functools
+import threading
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from datetime import datetime
 import json
 
@@ -18,6 +22,17 @@ if not DATABASE_URL:
 _connection_tested = False
 _connection_available = False
 
+# Connection pool, created per process on first use. Every request thread
+# (GUNICORN_THREADS per worker) plus the background project writer can hold
+# a connection at once. The pool raises PoolError beyond its maximum, so
+# _pool_slots makes extra callers (e.g. the unbounded dev server) wait instead.
+POOL_MAX_CONNECTIONS = int(os.getenv('GUNICORN_THREADS', 4)) + 1
+POOL_MIN_CONNECTIONS = min(2, POOL_MAX_CONNECTIONS)
+_pool = None
+_pool_slots = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
 
 def test_connection():
     """Test if Supabase connection is available"""
@@ -39,17 +54,90 @@ def test_connection():
         return False
 
 
+def _get_pool():
+    """Get this process's connection pool, creating it if needed"""
+    global _pool, _pool_slots, _pool_pid
+    
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            # Connections inherited through fork can't be shared with the
+            # parent, so each worker process builds its own pool
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ThreadedConnectionPool(POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, DATABASE_URL)
+                _pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def _is_alive(conn):
+    """Check a pooled connection with a trivial query before it's used"""
+    if conn.closed:
+        return False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+
 def get_connection():
-    """Get database connection"""
+    """
+    Borrow a database connection from the pool, waiting while all are in
+    use. A connection that went stale while idle (e.g. closed by the server)
+    is swapped for a fresh one before any statement runs, so queries are
+    never replayed.
+    """
+    pool = _get_pool()
+    _pool_slots.acquire()
     try:
-        return psycopg2.connect(DATABASE_URL)
+        conn = pool.getconn()
+        if not _is_alive(conn):
+            print("⚠ Database connection lost, reconnecting")
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        return conn
     except Exception as e:
+        _pool_slots.release()
         print(f"✗ Supabase connection failed: {e}")
         raise
 
 
+def release_connection(conn):
+    """Return a connection to the pool, discarding it if it was closed"""
+    try:
+        _get_pool().putconn(conn, close=bool(conn.closed))
+    finally:
+        _pool_slots.release()
+
+
+def close_pool():
+    """Close all pooled connections"""
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.closeall()
+
+
+atexit.register(close_pool)
+
+
+def _retry_on_disconnect(func):
+    """
+    Run a read-only query function once more if its connection dropped
+    mid-query. Only for reads: a write may have been committed before the
+    error arrived, and replaying it would apply it twice.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            print(f"⚠ Database connection lost ({e}), retrying")
+            return func(*args, **kwargs)
+    return wrapper
+
+
 def initialize_db():
-    """Initialize database tables"""
+    """Initialize the connection pool and database tables"""
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -95,13 +183,23 @@ def initialize_db():
                 designs JSONB,
                 ml_data JSONB,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                guest BOOLEAN DEFAULT FALSE
+                guest BOOLEAN DEFAULT FALSE,
+                uid VARCHAR(32)
             )
         """)
+        cursor.execute("ALTER TABLE projects ADD COLUMN IF NOT EXISTS uid VARCHAR(32)")
         
         # Create indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at DESC)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_user ON projects(user_id)")
+        # uid is unique so a batch retried after an ambiguous failure can't
+        # insert a project twice; drop duplicates left by earlier versions
+        cursor.execute("DROP INDEX IF EXISTS idx_projects_uid")
+        cursor.execute("""
+            DELETE FROM projects a USING projects b
+            WHERE a.uid = b.uid AND a.id > b.id
+        """)
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_projects_uid_unique ON projects(uid)")
         
         conn.commit()
         print("✓ Supabase PostgreSQL connected and tables initialized")
@@ -111,42 +209,42 @@ def initialize_db():
         print(f"⚠ Database initialization warning: {e}")
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
-def save_project(constraints, designs, ml_data=None, user_id=None):
-    """Save a project to database"""
-    import json
-    
+def save_projects(projects):
+    """Save several (project_uid, constraints, designs, ml_data, user_id) items in one INSERT"""
     conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        cursor.execute("""
-            INSERT INTO projects (user_id, constraints, designs, ml_data, guest)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            user_id,
-            json.dumps(constraints),
-            json.dumps(designs),
-            json.dumps(ml_data or {}),
-            user_id is None
-        ))
-        
-        project_id = cursor.fetchone()[0]
+        execute_values(cursor, """
+            INSERT INTO projects (uid, user_id, constraints, designs, ml_data, guest)
+            VALUES %s
+            ON CONFLICT (uid) DO NOTHING
+        """, [
+            (
+                project_uid,
+                user_id,
+                json.dumps(constraints),
+                json.dumps(designs),
+                json.dumps(ml_data or {}),
+                user_id is None
+            )
+            for project_uid, constraints, designs, ml_data, user_id in projects
+        ])
         conn.commit()
-        return str(project_id)
         
     except Exception as e:
         conn.rollback()
-        print(f"Error saving project: {e}")
+        print(f"Error saving projects: {e}")
         raise
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
+@_retry_on_disconnect
 def list_projects(limit=50, user_id=None, guest=False):
     """List recent projects"""
     import json
@@ -195,18 +293,22 @@ def list_projects(limit=50, user_id=None, guest=False):
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
+@_retry_on_disconnect
 def get_project(project_id):
-    """Get a specific project by ID"""
+    """Get a specific project by integer ID or generation-time uid"""
     import json
     
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=RealDictCursor)
     
     try:
-        cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
+        if isinstance(project_id, int):
+            cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
+        else:
+            cursor.execute("SELECT * FROM projects WHERE uid = %s", (project_id,))
         row = cursor.fetchone()
         
         if row:
@@ -225,7 +327,7 @@ def get_project(project_id):
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
 def clear_projects(user_id=None, guest=False):
@@ -251,7 +353,7 @@ def clear_projects(user_id=None, guest=False):
         raise
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
 def create_user(name, email, password=None, oauth_provider=None, oauth_id=None):
@@ -279,9 +381,10 @@ def create_user(name, email, password=None, oauth_provider=None, oauth_id=None):
         raise
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
+@_retry_on_disconnect
 def verify_user(email, password):
     """Verify user credentials"""
     conn = get_connection()
@@ -302,9 +405,10 @@ def verify_user(email, password):
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
+@_retry_on_disconnect
 def get_user_by_email(email):
     """Get user by email"""
     conn = get_connection()
@@ -325,7 +429,7 @@ def get_user_by_email(email):
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
 
 
 def update_user_oauth(user_id, provider, oauth_id):
@@ -344,4 +448,4 @@ def update_user_oauth(user_id, provider, oauth_id):
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
@@ -3,6 +3,165 @@ Sustainability Evaluation Module
 Calculates sustainability metrics and impact scores
 """
 
+from jit import njit
+
+# Integer codes passed to the compiled scoring kernels (-1 = unknown)
+CLIMATE_CODES = {'cold': 0, 'moderate': 1, 'hot': 2}
+PRIORITY_CODES = {'energy': 0, 'water': 1, 'materials': 2}
+DESIGN_CODES = {'design-a': 0, 'design-b': 1, 'design-c': 2}
+CARBON_LEVELS = ('Low', 'Medium', 'High')
+
+
+def _code(codes, value):
+    """Look up a kernel code, -1 for unknown or non-string values"""
+    return codes.get(value, -1) if isinstance(value, str) else -1
+
+
+@njit(cache=True)
+def _energy_kernel(area, budget, climate_code, priority_code, design_code, renewable_ready):
+    """Energy efficiency score (0-100) from encoded inputs"""
+    # Base score
+    score = 50
+    
+    # Budget influence
+    if budget >= 75:
+        score += 20
+    elif budget >= 50:
+        score += 10
+    
+    # Priority influence - STRONG for energy focus
+    if priority_code == 0:
+        score += 25
+    
+    # Climate adjustments
+    if climate_code == 0:
+        score += 5
+    elif climate_code == 2:
+        score -= 5
+    
+    # Area efficiency (smaller or medium sized better)
+    if area < 800:
+        score += 8
+    elif area > 1600:
+        score -= 5
+    
+    # Design-specific factors
+    if design_code == 0:
+        score += 15
+    elif design_code == 2:
+        score += 8
+    elif design_code == 1:
+        score += 6
+
+    if renewable_ready:
+        score += 4
+    
+    # Ensure score is within bounds
+    return max(0, min(100, score))
+
+
+@njit(cache=True)
+def _water_kernel(area, budget, climate_code, priority_code, design_code):
+    """Water efficiency score (0-100) from encoded inputs"""
+    # Base score
+    score = 50
+    
+    # Priority influence - STRONG for water focus
+    if priority_code == 1:
+        score += 30
+    
+    # Budget influence
+    if budget >= 60:
+        score += 15
+    elif budget < 30:
+        score -= 10
+    
+    # Climate influence (hot climates need more water efficiency)
+    if climate_code == 2:
+        score += 20
+    elif climate_code == 1:
+        score += 10
+    
+    # Area influence (larger areas benefit from systems)
+    if area > 1200:
+        score += 8
+
+    # Design-specific boosts (make water-focused design stand out)
+    if design_code == 2:
+        score += 22
+    elif design_code == 0:
+        score += 5
+    elif design_code == 1:
+        score += 8
+    
+    # Ensure score is within bounds
+    return max(0, min(100, score))
+
+
+@njit(cache=True)
+def _materials_kernel(budget, priority_code, design_code):
+    """Materials sustainability score (0-100) from encoded inputs"""
+    # Base score
+    score = 50
+
+    # Design-specific boosts - STRONG for carbon-optimized
+    if design_code == 1:
+        # Carbon-optimized is materials-forward
+        score += 25
+    elif design_code == 2:
+        # Regenerative uses advanced materials
+        score += 15
+    elif design_code == 0:
+        # Eco-efficient uses high-performance envelope
+        score += 10
+
+    # Priority influence - STRONG for materials focus
+    if priority_code == 2:
+        score += 28
+
+    # Budget influence
+    if budget >= 70:
+        score += 10
+    elif budget < 30:
+        score -= 8
+
+    return max(0, min(100, score))
+
+
+@njit(cache=True)
+def _carbon_kernel(energy_efficiency, budget, embodied_carbon):
+    """Carbon level code (0=Low, 1=Medium, 2=High)"""
+    # Combined assessment
+    if energy_efficiency > 75 and budget > 60 and embodied_carbon < 18:
+        return 0
+    elif energy_efficiency > 55 or budget > 50:
+        return 1
+    else:
+        return 2
+
+
+@njit(cache=True)
+def _score_kernel(area, budget, climate_code, priority_code, design_code,
+                  renewable_ready, embodied_carbon):
+    """
+    Score a design in a single native call
+    
+    Returns:
+        (energy, water, materials, carbon_code)
+    """
+    energy = _energy_kernel(area, budget, climate_code, priority_code, design_code, renewable_ready)
+    water = _water_kernel(area, budget, climate_code, priority_code, design_code)
+    materials = _materials_kernel(budget, priority_code, design_code)
+    carbon_code = _carbon_kernel(energy, budget, embodied_carbon)
+    return energy, water, materials, carbon_code
+
+
+def warm_up_kernels():
+    """Compile the scoring kernels ahead of the first request"""
+    _score_kernel(1000, 50, 1, 0, 0, True, 25.0)
+    _score_kernel(1000, 50.0, 1, 0, 0, True, 25.0)
+
+
 
 class SustainabilityEvaluator:
     """
@@ -30,25 +189,42 @@ class SustainabilityEvaluator:
         Returns:
             Dict with energy, water, and carbon metrics
         """
+        estimated_cost = self._estimate_cost(constraints['area'], constraints['budget'])
+        return self._build_metrics(design, constraints, estimated_cost)
+    
+    def evaluate_batch(self, designs, constraints):
+        """
+        Evaluate several designs against the same constraints in one pass
+        
+        Args:
+            designs: List of design objects from generator
+            constraints: User constraints shared by all designs
+        
+        Returns:
+            List of metric dicts, in the same order as designs
+        """
+        # Cost only depends on the constraints, so estimate it once
+        estimated_cost = self._estimate_cost(constraints['area'], constraints['budget'])
+        return [self._build_metrics(design, constraints, estimated_cost) for design in designs]
+    
+    def _build_metrics(self, design, constraints, estimated_cost):
+        """Assemble the metric dict for a single design"""
         area = constraints['area']
         budget = constraints['budget']
-        climate = constraints['climate']
         priority = constraints['priority']
         
-        # Calculate individual metrics
-        energy_score = self._evaluate_energy(design, constraints)
-        water_score = self._evaluate_water(design, constraints)
-        materials_score = self._evaluate_materials(design, constraints)
-        carbon_level = self._evaluate_carbon(design, constraints)
+        # Calculate individual metrics in one kernel call
+        energy_score, water_score, materials_score, carbon_code = _score_kernel(
+            *self._encode(design, constraints),
+            self._embodied_carbon(design)
+        )
+        carbon_level = CARBON_LEVELS[carbon_code]
         
         # Calculate sustainability index
         sustainability_index = self._calculate_sustainability_index(
             energy_score, water_score, materials_score, priority
         )
         
-        # Estimate cost
-        estimated_cost = self._estimate_cost(area, budget)
-        
         return {
             'energyEfficiency': energy_score,
             'waterEfficiency': water_score,
@@ -63,116 +239,23 @@ class SustainabilityEvaluator:
             }
         }
     
-    def _evaluate_energy(self, design, constraints):
-        """
-        Calculate energy efficiency score (0-100)
-        Based on design characteristics and constraints
-        """
-        area = constraints['area']
-        budget = constraints['budget']
-        climate = constraints['climate']
-        priority = constraints['priority']
-        
-        # Base score
-        score = 50
-        
-        # Budget influence
-        if budget >= 75:
-            score += 20
-        elif budget >= 50:
-            score += 10
-        
-        # Priority influence - STRONG for energy focus
-        if priority == 'energy':
-            score += 25
-        
-        # Climate adjustments
-        if climate == 'cold':
-            score += 5
-        elif climate == 'hot':
-            score -= 5
-        
-        # Area efficiency (smaller or medium sized better)
-        if area < 800:
-            score += 8
-        elif area > 1600:
-            score -= 5
-        
-        # Design-specific factors
-        if design.get('id') == 'design-a':
-            score += 15
-        elif design.get('id') == 'design-c':
-            score += 8
-        elif design.get('id') == 'design-b':
-            score += 6
-
-        if 'renewable_ready' in design and design['renewable_ready']:
-            score += 4
-        
-        # Ensure score is within bounds
-        return max(0, min(100, score))
-    
-    def _evaluate_water(self, design, constraints):
-        """
-        Calculate water efficiency score (0-100)
-        Based on water management strategies
-        """
-        area = constraints['area']
-        budget = constraints['budget']
-        climate = constraints['climate']
-        priority = constraints['priority']
-        
-        # Base score
-        score = 50
-        
-        # Priority influence - STRONG for water focus
-        if priority == 'water':
-            score += 30
-        
-        # Budget influence
-        if budget >= 60:
-            score += 15
-        elif budget < 30:
-            score -= 10
-        
-        # Climate influence (hot climates need more water efficiency)
-        if climate == 'hot':
-            score += 20
-        elif climate == 'moderate':
-            score += 10
-        
-        # Area influence (larger areas benefit from systems)
-        if area > 1200:
-            score += 8
-
-        # Design-specific boosts (make water-focused design stand out)
-        if design.get('id') == 'design-c':
-            score += 22
-        elif design.get('id') == 'design-a':
-            score += 5
-        elif design.get('id') == 'design-b':
-            score += 8
-        
-        # Ensure score is within bounds
-        return max(0, min(100, score))
+    def _encode(self, design, constraints):
+        """Encode design and constraints into kernel arguments"""
+        return (
+            constraints['area'],
+            constraints['budget'],
+            _code(CLIMATE_CODES, constraints['climate']),
+            _code(PRIORITY_CODES, constraints['priority']),
+            _code(DESIGN_CODES, design.get('id')),
+            bool(design.get('renewable_ready', False))
+        )
     
-    def _evaluate_carbon(self, design, constraints):
-        """
-        Calculate carbon footprint level (Low/Medium/High)
-        Simplified categorical assessment
-        """
-        energy_efficiency = self._evaluate_energy(design, constraints)
-        budget = constraints['budget']
-        
-        embodied_carbon = design.get('estimated_embodied_carbon', 25)
-        
-        # Combined assessment
-        if energy_efficiency > 75 and budget > 60 and embodied_carbon < 18:
-            return 'Low'
-        elif energy_efficiency > 55 or budget > 50:
-            return 'Medium'
-        else:
-            return 'High'
+    def _embodied_carbon(self, design):
+        """Embodied carbon as a float for the kernel, 25 when missing or not a number"""
+        value = design.get('estimated_embodied_carbon', 25)
+        if isinstance(value, (int, float)):
+            return float(value)
+        return 25.0
     
     def _calculate_sustainability_index(self, energy, water, materials, priority):
         """
@@ -194,40 +277,6 @@ class SustainabilityEvaluator:
         
         return round(index)
 
-    def _evaluate_materials(self, design, constraints):
-        """
-        Calculate materials sustainability score (0-100)
-        Based on design type, budget, and priority
-        """
-        budget = constraints['budget']
-        priority = constraints['priority']
-
-        # Base score
-        score = 50
-
-        # Design-specific boosts - STRONG for carbon-optimized
-        if design.get('id') == 'design-b':
-            # Carbon-optimized is materials-forward
-            score += 25
-        elif design.get('id') == 'design-c':
-            # Regenerative uses advanced materials
-            score += 15
-        elif design.get('id') == 'design-a':
-            # Eco-efficient uses high-performance envelope
-            score += 10
-
-        # Priority influence - STRONG for materials focus
-        if priority == 'materials':
-            score += 28
-
-        # Budget influence
-        if budget >= 70:
-            score += 10
-        elif budget < 30:
-            score -= 8
-
-        return max(0, min(100, score))
-    
     def _estimate_cost(self, area, budget):
         """
         Estimate project cost based on area and budget level
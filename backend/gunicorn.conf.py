@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for the Sustainable Design API
+
+Loads the app once in the master (preload) so ML training runs a single
+time and forked workers share the trained models copy-on-write.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# One process per usable core (capped, since each worker opens its own
+# database pool), each with a few threads for I/O-bound requests
+MAX_DEFAULT_WORKERS = 4
+
+
+def _usable_cpus():
+    # CPUs this process may run on (respects affinity/cpusets), not the host's count
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+workers = int(os.getenv('WEB_CONCURRENCY', min(_usable_cpus(), MAX_DEFAULT_WORKERS)))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Move the preloaded objects (trained models, training data) into the
+    # permanent generation so garbage collection in the workers never
+    # writes to them and un-shares their copy-on-write pages
+    gc.freeze()
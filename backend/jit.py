@@ -0,0 +1,17 @@
+"""
+Optional Numba JIT Support
+Compiles numeric kernels to native code when numba is installed,
+otherwise leaves them as plain Python functions
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
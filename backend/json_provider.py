@@ -0,0 +1,39 @@
+"""
+Fast JSON Serialization
+Flask JSON provider backed by orjson, used when orjson is installed
+"""
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Serializes jsonify() and dict return values with orjson.
+    Types orjson doesn't handle natively (and datetimes, to keep Flask's
+    HTTP-date format) go through Flask's default conversion.
+    """
+    
+    mimetype = 'application/json'
+    option = (
+        (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        if ORJSON_AVAILABLE else 0
+    )
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Write orjson's bytes straight into the response, skipping str encode
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,135 @@
+"""
+Background Project Persistence
+Saves generated projects off the request path so responses don't wait
+for the database round-trip
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+import uuid
+
+
+class ProjectWriter:
+    """
+    Queues projects for a single daemon thread that writes them in batches.
+    Project IDs are allocated up front as UUIDs so callers can return them
+    before the row is written. Projects arriving in a burst are coalesced
+    into one insert per flush.
+    """
+    
+    MAX_QUEUE = 1000  # projects waiting to be written; newer ones are dropped beyond this
+    MAX_BATCH = 50
+    FLUSH_INTERVAL = 0.1  # seconds to wait for more projects after the first
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 0.5  # seconds, doubled after each failed attempt
+    # Errors raised while serializing a project (e.g. json.dumps); retrying
+    # can't fix them, so the batch is split to isolate the bad project
+    NON_TRANSIENT_ERRORS = (TypeError, ValueError)
+    
+    def __init__(self, save_many_fn):
+        """
+        Args:
+            save_many_fn: Callable taking a list of
+                (project_uid, constraints, designs, ml_data, user_id) items
+        """
+        self.save_many_fn = save_many_fn
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+    
+    def submit(self, constraints, designs, ml_data=None, user_id=None):
+        """
+        Queue a project for saving
+        
+        Returns:
+            project_uid (str) the row will be stored under, or None if the
+            queue is full and the project was dropped
+        """
+        project_uid = uuid.uuid4().hex
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((project_uid, constraints, designs, ml_data, user_id))
+        except queue.Full:
+            print(f"⚠ Project queue full, not saving project {project_uid}")
+            return None
+        return project_uid
+    
+    def close(self, timeout=5.0):
+        """Flush pending writes and stop the worker"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def _ensure_worker(self):
+        """Start the worker in this process (threads don't survive fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.MAX_QUEUE)
+            self._thread = threading.Thread(target=self._run, name='project-writer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            # Collect whatever else arrives shortly after, up to MAX_BATCH
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._flush(batch)
+            if stopping:
+                return
+    
+    def _flush(self, batch):
+        """
+        Write a batch, retrying the whole batch with backoff on database errors.
+        save_many_fn must skip uids that are already stored, since a failed
+        attempt may still have committed.
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                self.save_many_fn(batch)
+                return
+            except self.NON_TRANSIENT_ERRORS as e:
+                if len(batch) == 1:
+                    print(f"❌ Dropping project {batch[0][0]}: {e}")
+                    return
+                # Save one at a time so a single bad project can't sink the others
+                print(f"⚠ Saving batch of {len(batch)} projects failed ({e}), saving individually")
+                for item in batch:
+                    self._flush([item])
+                return
+            except Exception as e:
+                print(f"⚠ Saving batch of {len(batch)} projects failed (attempt {attempt + 1}): {e}")
+                if attempt + 1 < self.MAX_ATTEMPTS:
+                    time.sleep(self.RETRY_BASE_DELAY * (2 ** attempt))
+        print(f"❌ Dropping {len(batch)} projects after {self.MAX_ATTEMPTS} attempts")
@@ -7,6 +7,38 @@ import random
 import math
 from typing import List, Dict
 
+from jit import njit
+
+# Ranking weights per priority as (energy, water, carbon), built once at import
+PRIORITY_WEIGHTS = {
+    'energy': (0.5, 0.2, 0.3),
+    'water': (0.2, 0.5, 0.3),
+    'materials': (0.2, 0.2, 0.6)
+}
+
+# Carbon footprint level -> ranking score (anything else scores 0.2)
+CARBON_SCORES = {'Low': 1.0, 'Medium': 0.6}
+
+
+@njit(cache=True)
+def _shared_cost_kernel(mean_cost, area, budget, area_coef, budget_coef, climate_cost):
+    """Cost terms shared by every design for the same constraints"""
+    base = mean_cost * 0.7
+    area_cost = (area / 1000) * area_coef
+    budget_cost = (budget / 100) * budget_coef
+    return base + area_cost + budget_cost + climate_cost
+
+
+@njit(cache=True)
+def _clamp_cost_kernel(total):
+    """Clamp a predicted cost to the supported range"""
+    return max(10000.0, min(500000.0, total))
+
+
+def warm_up_kernels():
+    """Compile the cost kernels ahead of the first request"""
+    _clamp_cost_kernel(_shared_cost_kernel(100000.0, 1000.0, 50.0, 150.0, 500.0, 0.0))
+
 
 class SimpleCostPredictor:
     """
@@ -42,14 +74,34 @@ class SimpleCostPredictor:
         if not self.is_trained:
             return None
         
-        base = self.mean_cost * 0.7
-        area_cost = (area / 1000) * self.coefficients['area']
-        budget_cost = (budget / 100) * self.coefficients['budget']
-        climate_cost = self.coefficients['climate'].get(climate, 0)
+        shared = self._shared_cost(area, budget, climate)
         design_cost = self.coefficients['design'][design_id] if design_id < 3 else 0
+        return _clamp_cost_kernel(shared + design_cost)
+    
+    def predict_batch(self, area, budget, climate, priority, design_ids):
+        """Predict costs for several designs sharing the same constraints"""
+        if not self.is_trained:
+            return [None] * len(design_ids)
+        
+        # Everything except the design term is shared across the batch
+        shared = self._shared_cost(area, budget, climate)
+        design_costs = self.coefficients['design']
         
-        total = base + area_cost + budget_cost + climate_cost + design_cost
-        return max(10000, min(500000, total))
+        return [
+            _clamp_cost_kernel(shared + (design_costs[design_id] if design_id < 3 else 0))
+            for design_id in design_ids
+        ]
+    
+    def _shared_cost(self, area, budget, climate):
+        """Evaluate the design-independent part of the cost formula"""
+        return _shared_cost_kernel(
+            float(self.mean_cost),
+            float(area),
+            float(budget),
+            float(self.coefficients['area']),
+            float(self.coefficients['budget']),
+            float(self.coefficients['climate'].get(climate, 0))
+        )
     
     def get_feature_importance(self):
         """Get importance of features"""
@@ -67,9 +119,8 @@ class SimpleDesignRanker:
     def __init__(self):
         self.is_trained = False
         self.priority_weights = {
-            'energy': {'energy': 0.5, 'water': 0.2, 'carbon': 0.3},
-            'water': {'energy': 0.2, 'water': 0.5, 'carbon': 0.3},
-            'materials': {'energy': 0.2, 'water': 0.2, 'carbon': 0.6}
+            priority: dict(zip(('energy', 'water', 'carbon'), weights))
+            for priority, weights in PRIORITY_WEIGHTS.items()
         }
     
     def train(self, data):
@@ -83,7 +134,9 @@ class SimpleDesignRanker:
             return designs
         
         priority = constraints.get('priority', 'energy')
-        weights = self.priority_weights.get(priority, self.priority_weights['energy'])
+        energy_weight, water_weight, carbon_weight = PRIORITY_WEIGHTS.get(
+            priority, PRIORITY_WEIGHTS['energy']
+        )
         
         scored = []
         for design in designs:
@@ -92,14 +145,12 @@ class SimpleDesignRanker:
             # Calculate weighted score
             energy_score = metrics.get('energyEfficiency', 50) / 100
             water_score = metrics.get('waterEfficiency', 50) / 100
-            carbon_score = 1.0 if metrics.get('carbonFootprint') == 'Low' else (
-                0.6 if metrics.get('carbonFootprint') == 'Medium' else 0.2
-            )
+            carbon_score = CARBON_SCORES.get(metrics.get('carbonFootprint'), 0.2)
             
             weighted_score = (
-                energy_score * weights['energy'] +
-                water_score * weights['water'] +
-                carbon_score * weights['carbon']
+                energy_score * energy_weight +
+                water_score * water_weight +
+                carbon_score * carbon_weight
             ) * 100
             
             scored.append((design, weighted_score))
@@ -111,13 +162,44 @@ class SimpleDesignRecommender:
     """Recommends designs based on similar projects"""
     
     def __init__(self):
+        self.is_trained = False
         self.historical = []
+        # priority -> (matching projects, (best design, confidence))
+        self._by_priority = {}
+        self._fallback = ((), None)
     
     def learn_from_history(self, projects):
         """Store historical project data"""
         self.historical = projects
+        
+        # Group projects by priority once so a recommendation only touches
+        # the projects it returns, not the whole history
+        groups = {}
+        for p in projects:
+            groups.setdefault(p['constraints']['priority'], []).append(p)
+        self._by_priority = {
+            priority: (tuple(similar), self._most_chosen(similar))
+            for priority, similar in groups.items()
+        }
+        fallback = tuple(projects[:3])
+        self._fallback = (fallback, self._most_chosen(fallback))
+        
+        self.is_trained = True
         return self
     
+    def _most_chosen(self, similar):
+        """Most common chosen design among projects, with its share"""
+        design_counts = {}
+        for p in similar:
+            design_id = p.get('chosen_design', 0)
+            design_counts[design_id] = design_counts.get(design_id, 0) + 1
+        
+        if not design_counts:
+            return None
+        
+        best_design = max(design_counts, key=design_counts.get)
+        return best_design, design_counts[best_design] / len(similar)
+    
     def recommend_design(self, constraints, top_n=3):
         """Find similar historical projects and recommend"""
         if not self.historical:
@@ -129,32 +211,21 @@ class SimpleDesignRecommender:
         
         # Find similar projects
         priority = constraints.get('priority', 'energy')
-        similar = [p for p in self.historical 
-                  if p['constraints']['priority'] == priority]
-        
-        if not similar:
-            similar = self.historical[:3]
+        similar, best = self._by_priority.get(priority, self._fallback)
         
-        # Pick most common choice
-        design_counts = {}
-        for p in similar:
-            design_id = p.get('chosen_design', 0)
-            design_counts[design_id] = design_counts.get(design_id, 0) + 1
-        
-        if not design_counts:
+        if best is None:
             return {
                 'recommended_design': None,
                 'confidence': 0.0,
                 'similar_projects': []
             }
         
-        best_design = max(design_counts, key=design_counts.get)
-        confidence = design_counts[best_design] / len(similar)
+        best_design, confidence = best
         
         return {
             'recommended_design': best_design,
             'confidence': min(1.0, confidence),
-            'similar_projects': similar[:top_n]
+            'similar_projects': list(similar[:top_n])
         }
 
 
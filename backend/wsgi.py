@@ -0,0 +1,9 @@
+"""
+WSGI entry point for production servers
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+from app import app
+
+__all__ = ['app']